@@ -2,17 +2,25 @@
 
 # Source: https://stackoverflow.com/questions/11760578/argparse-arguments-nesting
 
-import argparse
 
-parser = argparse.ArgumentParser(description='Deployment tool')
-subparsers = parser.add_subparsers()
+def main():
+    # Import here: loading this file with runpy/importlib, without running
+    # main(), does not import argparse
+    import argparse
 
-add_p = subparsers.add_parser('add')
-add_p.add_argument("name")
-add_p.add_argument("--web_port")
+    parser = argparse.ArgumentParser(description='Deployment tool')
+    subparsers = parser.add_subparsers()
 
-upg_p = subparsers.add_parser('upgrade')
-upg_p.add_argument("name")
+    add_p = subparsers.add_parser('add')
+    add_p.add_argument("name")
+    add_p.add_argument("--web_port")
 
+    upg_p = subparsers.add_parser('upgrade')
+    upg_p.add_argument("name")
 
-args = parser.parse_args()
+    args = parser.parse_args()
+    return args
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,117 @@
 
 # Run like this:
 #   python3 python_cli.py -vvvv demo
+# Debug messages can be turned off with APP_DEBUG=0 or python -O
 # Author: mrjk
 
 import os
 import sys
 import logging
 import argparse
-from pprint import pprint
+import functools
 
+# Skip caller/thread/process lookups on each log record, none of them
+# are used by our formats. Do not use a format with %(pathname)s,
+# %(lineno)d or %(funcName)s with these settings.
+logging._srcfile = None  # pylint: disable=protected-access
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
 
+# Debug logging gate, checked before isEnabledFor()
+_DEBUG = __debug__ and os.environ.get("APP_DEBUG", "1") == "1"
+
+# Defaults for demo --env and --choice
+_APP_SETTING_DEFAULT = os.environ.get("APP_SETTING", "Unset")
+_CHOICES = ("choice1", "choice2")
+
+# Shared formatter and console handler, created once
+_FORMATTER = logging.Formatter("%(levelname)8s: %(message)s", "%H:%M:%S")
+_CONSOLE_HANDLER = logging.StreamHandler()
+_CONSOLE_HANDLER.setLevel(level=logging.DEBUG)
+_CONSOLE_HANDLER.setFormatter(_FORMATTER)
+
+
+def _register_commands(cls):
+    """Build the class sub commands table from its cli_* methods"""
+
+    cls._COMMANDS = {
+        name[4:]: getattr(cls, name) for name in dir(cls) if name.startswith("cli_")
+    }
+    return cls
+
+
+def _build_demo(subparsers):
+    """Add command: demo"""
+
+    add_p = subparsers.add_parser("demo")
+    add_p.add_argument("--env", default=_APP_SETTING_DEFAULT)
+    add_p.add_argument("--choice", choices=_CHOICES, type=str)
+    add_p.add_argument("-s", "--store", action="store_true")
+    add_p.add_argument("-a", "--append", dest="appended", action="append")
+    # add_p.add_argument("--short", default=True, required=True)
+    # add_p.add_argument("argument1")
+    # add_p.add_argument("double_args", nargs=2)
+    add_p.add_argument("nargs", nargs="*")
+
+
+def _build_sub2(subparsers):
+    """Add command: subcommand2"""
+
+    upg_p = subparsers.add_parser("subcommand2")
+    upg_p.add_argument("name")
+
+
+_SUBPARSER_BUILDERS = {
+    "demo": _build_demo,
+    "subcommand2": _build_sub2,
+}
+
+
+class _PartialParserError(Exception):
+    """Raised instead of exiting when a partial parser fails"""
+
+
+class _PartialArgumentParser(argparse.ArgumentParser):
+    """Parser that lets caller retry with all subcommands on error"""
+
+    def error(self, message):
+        raise _PartialParserError(message)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_parser(command=None):
+    """Build main parser, with only command subparser or all of them if None"""
+
+    # Manage main parser
+    parser_class = _PartialArgumentParser if command else argparse.ArgumentParser
+    parser = parser_class(description="Deployment tool")
+    parser.add_argument(
+        "-v", "--verbose", action="count", default=0, help="Increase verbosity"
+    )
+    parser.add_argument("help", action="count", default=0, help="Show usage")
+    subparsers = parser.add_subparsers(
+        title="subcommands", description="valid subcommands", dest="command"
+    )
+
+    # Only build the requested subcommand, or all of them for help/errors
+    if command:
+        _SUBPARSER_BUILDERS[command](subparsers)
+    else:
+        for build in _SUBPARSER_BUILDERS.values():
+            build(subparsers)
+
+    return parser
+
+
+@_register_commands
 class CmdApp:
     """Main CmdApp"""
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _register_commands(cls)
+
     def __init__(self):
         """Start new App"""
 
@@ -24,34 +123,36 @@ class CmdApp:
     def get_args(self):
         """Prepare command line"""
 
-        # Manage main parser
-        parser = argparse.ArgumentParser(description="Deployment tool")
-        parser.add_argument(
-            "-v", "--verbose", action="count", default=0, help="Increase verbosity"
-        )
-        parser.add_argument("help", action="count", default=0, help="Show usage")
-        subparsers = parser.add_subparsers(
-            title="subcommands", description="valid subcommands", dest="command"
-        )
-
-        # Manage command: demo
-        add_p = subparsers.add_parser("demo")
-        add_p.add_argument("--env", default=os.environ.get("APP_SETTING", "Unset"))
-        add_p.add_argument("--choice", choices=["choice1", "choice2"], type=str)
-        add_p.add_argument("-s", "--store", action="store_true")
-        add_p.add_argument("-a", "--append", dest="appended", action="append")
-        # add_p.add_argument("--short", default=True, required=True)
-        # add_p.add_argument("argument1")
-        # add_p.add_argument("double_args", nargs=2)
-        add_p.add_argument("nargs", nargs="*")
-
-        # Manage command: subcommand2
-        upg_p = subparsers.add_parser("subcommand2")
-        upg_p.add_argument("name")
-
-        # Register objects
-        self.parser = parser
-        self.args = parser.parse_args()
+        # Reuse the parser built for this subcommand, if any
+        name = self._sniff_subcommand(sys.argv)
+        if name not in _SUBPARSER_BUILDERS:
+            name = None
+
+        # Register objects, fall back on full parser for error messages
+        self.parser = _build_parser(name)
+        try:
+            self.args = self.parser.parse_args()
+        except _PartialParserError:
+            self.parser = _build_parser(None)
+            self.args = self.parser.parse_args()
+
+    @staticmethod
+    def _sniff_subcommand(argv):
+        """Return the first bare token from command line, if any
+
+        Only verbose flags may come before it, any other flag (like -vh
+        or --he) returns None so the full parser is built.
+        """
+
+        for arg in argv[1:]:
+            if not arg.startswith("-"):
+                return arg
+            if arg.rstrip("v") == "-" and len(arg) > 1:
+                continue
+            if len(arg) > 2 and "--verbose".startswith(arg):
+                continue
+            return None
+        return None
 
     def get_logger(self, logger_name=None, create_file=False, verbose=0):
         """Create CmdApp logger"""
@@ -61,44 +162,21 @@ class CmdApp:
             logger_name = __name__
 
         # Manage logging level
-        try:
-            loglevel = {
-                0: logging.ERROR,
-                1: logging.WARN,
-                2: logging.INFO,
-            }[verbose]
-        except KeyError:
-            loglevel = logging.DEBUG
+        loglevel = max(logging.DEBUG, logging.ERROR - verbose * 10)
 
         # Create logger for prd_ci
         log = logging.getLogger(logger_name)
         log.setLevel(level=loglevel)
 
-        # Formatters
-        format1 = "%(levelname)8s: %(message)s"
-        format2 = "%(asctime)s.%(msecs)03d|%(name)-16s%(levelname)8s: %(message)s"
-        format3 = (
-            "%(asctime)s.%(msecs)03d"
-            + " (%(process)d/%(thread)d) "
-            + "%(pathname)s:%(lineno)d:%(funcName)s"
-            + ": "
-            + "%(levelname)s: %(message)s"
-        )
-        tformat1 = "%H:%M:%S"
-        tformat2 = "%Y-%m-%d %H:%M:%S"
-        formatter = logging.Formatter(format1, tformat1)
-
-        # Create console handler for logger.
-        ch = logging.StreamHandler()
-        ch.setLevel(level=logging.DEBUG)
-        ch.setFormatter(formatter)
-        log.addHandler(ch)
+        # Attach console handler, only once per logger
+        if _CONSOLE_HANDLER not in log.handlers:
+            log.addHandler(_CONSOLE_HANDLER)
 
         # Create file handler for logger.
         if isinstance(create_file, str):
             fh = logging.FileHandler(create_file)
             fh.setLevel(level=logging.DEBUG)
-            fh.setFormatter(formatter)
+            fh.setFormatter(_FORMATTER)
             log.addHandler(fh)
 
         # Return objects
@@ -109,15 +187,15 @@ class CmdApp:
         """Main cli command"""
 
         # Dispatch sub commands
-        if self.args.command:
-            method = "cli_" + str(self.args.command)
-            if hasattr(self, method):
-                getattr(self, method)()
-            else:
-                self.log.error(f"Subcommand {self.args.command} does not exists.")
-        else:
+        if not self.args.command:
             self.log.error("Missing sub command")
             self.parser.print_help()
+            return
+        handler = self._COMMANDS.get(self.args.command)
+        if handler is None:
+            self.log.error("Subcommand %s does not exists.", self.args.command)
+            return
+        handler(self)
 
     def cli_demo(self):
         """Display how to use logging"""
@@ -125,7 +203,8 @@ class CmdApp:
         self.log.error("Test Critical message")
         self.log.warning("Test Warning message")
         self.log.info("Test Info message")
-        self.log.debug(f"Command line vars: {vars(self.args)}")
+        if _DEBUG and self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug("Command line vars: %s", vars(self.args))
 
 
 if __name__ == "__main__":
@@ -8,11 +8,10 @@ This CLI provides a similar experience as the git CLI, but in Python with Typer.
 
 Example:
 ``` py title="test.py"
-from my_app.cli import cli_app
+from my_app.cli import get_cli_app
 
-myapp = cli_app()
-myapp.info()
-myapp.apply()
+cli_app = get_cli_app()
+cli_app(["command1", "--format", "json"])
 ```
 
 This is a quite complete CLI template for your App, you will probably want
@@ -37,11 +36,17 @@ import os
 import sys
 import traceback
 from enum import Enum
-from pathlib import Path
-from pprint import pprint
-from typing import Optional
 
-import typer
+# Skip caller/thread/process lookups on each log record, none of them
+# are used by our formats. Do not use a format with %(pathname)s,
+# %(lineno)d or %(funcName)s with these settings.
+logging._srcfile = None  # pylint: disable=protected-access
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+# Heavy imports (typer, pathlib ...) are deferred into get_cli_app(), and
+# pprint into its only user, so `--version` stays cheap.
 
 # import sh
 # import pyaml
@@ -53,6 +58,9 @@ import typer
 logging.basicConfig(format="%(levelname)8s: %(message)s")
 logger = logging.getLogger()
 
+# Package logger configured by main(), looked up once
+_PKG_LOGGER = logging.getLogger(__package__)
+
 
 # Application Application
 # ===============================
@@ -68,6 +76,20 @@ class MyAppException(Exception):
     """Generic MyApp exception"""
     rc = 1
 
+# Exceptions reported to the user without traceback
+_USER_ERRORS = (
+    PermissionError,
+    FileExistsError,
+    FileNotFoundError,
+    InterruptedError,
+    IsADirectoryError,
+    NotADirectoryError,
+    TimeoutError,
+    MyAppException,
+    # yaml.parser.ParserError,
+    # sh.ErrorReturnCode,
+)
+
 class MyApp:
     "This is MyApp Class"
 
@@ -89,7 +111,7 @@ class MyApp:
         "Return an application exception"
         raise MyAppException("This failure does not create python tracebacks")
 
-        
+
 class OutputFormat(str, Enum):
     "Available output formats"
 
@@ -99,202 +121,248 @@ class OutputFormat(str, Enum):
     toml = "toml"
 
 
-# Core application definition
+# Exception handler
 # ===============================
+def clean_terminate(err):
+    "Terminate nicely the program depending the exception"
 
-# Define Typer application
-# -------------------
-cli_app = typer.Typer(
-    help="MyApp, that does something",
-    invoke_without_command=True,
-    no_args_is_help=True,
-)
+    if isinstance(err, _USER_ERRORS):
 
+        # Fetch extra error informations
+        rc = int(getattr(err, "rc", getattr(err, "errno", 1)))
+        advice = getattr(err, "advice", None)
+        if advice:
+            logger.warning("%s", advice)
 
-# Define an init function, with common options
-# -------------------
-@cli_app.callback()
-def main(
-    ctx: typer.Context,
-    verbose: int = typer.Option(0, "--verbose", "-v", count=True, min=0, max=3, help="Increase verbosity"),
-    working_dir: Path = typer.Option(
-        ".",  # For relative paths
-        # os.getcwd(),  # For abolute Paths
-        "-c",
-        "--config",
-        help="Path of myapp.yml configuration file or directory.",
-        envvar="MYAPP_PROJECT_DIR",
-    ),
-    version: bool = typer.Option(
-        False,
-        "--version",
-        "-V",
-        help="Show version",
-    ),
-):
-    """
-    MyApp Command Line Interface.
-    """
-
-    # Set logging level
-    # -------------------
-    # 50: Crit
-    # 40: Err
-    # 30: Warn
-    # 20: Info
-    # 10: Debug
-    # 0: Not set
-    logger = logging.getLogger(None if verbose >= 3 else __package__)
-    verbose = 30 - (verbose * 10)
-    verbose = verbose if verbose > 10 else logging.DEBUG
-    logger.setLevel(level=verbose)
-
-    # Init myapp
-    # -------------------
-    if version:
-        print(app_version)
-        return
+        # Log error and exit
+        logger.error("%s", err)
+        err_name = err.__class__.__name__
+        logger.critical("MyApp exited with error %s (%s)", err_name, rc)
+        sys.exit(rc)
 
-    ctx.obj = {
-        "myapp": MyApp(working_dir),
-    }
+    # Developper bug catchall
+    rc = 255
+    if logger.isEnabledFor(logging.ERROR):
+        logger.error("%s", traceback.format_exc())
+    logger.critical("Uncatched error: %s", err.__class__)
+    logger.critical("This is a bug, please report it.")
+    sys.exit(rc)
 
 
-# Simple commands example
+# Core application definition
 # ===============================
 
 
-@cli_app.command("help")
-def cli_help(
-    ctx: typer.Context,
-):
-    """Show this help message"""
-    print(ctx.parent.get_help())
+def _build_app():
+    "Register all commands and return the Typer application"
+
+    # pylint: disable=unused-variable
+
+    class LazyGroup(typer.core.TyperGroup):
+        "Click group that only builds sub groups from _LAZY_GROUPS when used"
 
+        def list_commands(self, ctx):
+            "List all commands, including not yet built sub groups"
+            cmds = super().list_commands(ctx)
+            return cmds + [name for name in _LAZY_GROUPS if name not in cmds]
 
-@cli_app.command("logging")
-def cli_logging():
-    """Test logging"""
+        def get_command(self, ctx, cmd_name):
+            "Return a command, build it first if it is a lazy sub group"
+            if cmd_name in _LAZY_GROUPS and cmd_name not in self.commands:
+                sub_app = _LAZY_GROUPS[cmd_name]()
+                self.add_command(typer.main.get_group(sub_app), cmd_name)
+            return super().get_command(ctx, cmd_name)
 
-    # Test logging:
+    # Define Typer application
     # -------------------
-    logger.critical("SHOW CRITICAL")
-    logger.error("SHOW ERROR")
-    logger.warning("SHOW WARNING")
-    logger.info("SHOW INFO")
-
-
-# pylint: disable=redefined-builtin
-@cli_app.command("command1")
-def cli_command1(
-    ctx: typer.Context,
-    mode: Optional[str] = typer.Option(
-        "Default Mode",
-        help="Write anything here",
-    ),
-    format: OutputFormat = typer.Option(
-        OutputFormat.yaml.value,
-        help="Output format",
-    ),
-    target: Optional[str] = typer.Argument(
-        None,
-        help="Target directory or all",
-    ),
-):
-    """Command1 example"""
-    myapp = ctx.obj["myapp"]
-
-    print(
-        f"Run {myapp} with '{target}' as target in mode '{mode}' in format '{format}'"
+    cli_app = typer.Typer(
+        cls=LazyGroup,
+        help="MyApp, that does something",
+        invoke_without_command=True,
+        no_args_is_help=True,
     )
-    print("This is a dump of our cli context:")
-    pprint(ctx.__dict__)
 
-    print("Run MyApp")
-    myapp.hello()
-    myapp.world()
+    # Define an init function, with common options
+    # -------------------
+    @cli_app.callback()
+    def main(
+        ctx: typer.Context,
+        verbose: int = typer.Option(0, "--verbose", "-v", count=True, min=0, max=3, help="Increase verbosity"),
+        working_dir: Path = typer.Option(
+            ".",  # For relative paths
+            # os.getcwd(),  # For abolute Paths
+            "-c",
+            "--config",
+            help="Path of myapp.yml configuration file or directory.",
+            envvar="MYAPP_PROJECT_DIR",
+        ),
+        version: bool = typer.Option(
+            False,
+            "--version",
+            "-V",
+            help="Show version",
+        ),
+    ):
+        """
+        MyApp Command Line Interface.
+        """
+
+        # Set logging level
+        # -------------------
+        # 50: Crit
+        # 40: Err
+        # 30: Warn
+        # 20: Info
+        # 10: Debug
+        # 0: Not set
+        log = logger if verbose >= 3 else _PKG_LOGGER
+        log.setLevel(level=max(logging.DEBUG, logging.WARN - verbose * 10))
+
+        # Init myapp
+        # -------------------
+        if version:
+            print(app_version)
+            return
+
+        ctx.obj = {
+            "myapp": MyApp(working_dir),
+        }
+
+    # Simple commands example
+    # -------------------
+    @cli_app.command("help")
+    def cli_help(
+        ctx: typer.Context,
+    ):
+        """Show this help message"""
+        print(ctx.parent.get_help())
+
+    @cli_app.command("logging")
+    def cli_logging():
+        """Test logging"""
+
+        # Test logging:
+        # -------------------
+        logger.critical("SHOW CRITICAL")
+        logger.error("SHOW ERROR")
+        logger.warning("SHOW WARNING")
+        logger.info("SHOW INFO")
+
+    # pylint: disable=redefined-builtin
+    @cli_app.command("command1")
+    def cli_command1(
+        ctx: typer.Context,
+        mode: Optional[str] = typer.Option(
+            "Default Mode",
+            help="Write anything here",
+        ),
+        format: OutputFormat = typer.Option(
+            OutputFormat.yaml.value,
+            help="Output format",
+        ),
+        target: Optional[str] = typer.Argument(
+            None,
+            help="Target directory or all",
+        ),
+    ):
+        """Command1 example"""
+        from pprint import pprint  # pylint: disable=import-outside-toplevel
+
+        myapp = ctx.obj["myapp"]
+
+        print(
+            f"Run {myapp} with '{target}' as target in mode '{mode}' in format '{format}'"
+        )
+        print("This is a dump of our cli context:")
+        pprint(ctx.__dict__)
+
+        print("Run MyApp")
+        myapp.hello()
+        myapp.world()
+
+    return cli_app
 
 
 # Source Command SubGroup Example
 # ===============================
-cli_src = typer.Typer(help="Manage sources")
-cli_app.add_typer(cli_src, name="group1")
+def _build_cli_src():
+    "Build the group1 sub group"
 
+    # pylint: disable=unused-variable
 
-@cli_src.callback()
-def src_callback():
-    """
-    Manage sources in the app.
-    """
-    print("Executed before all source commands")
+    cli_src = typer.Typer(name="group1", help="Manage sources", add_completion=False)
 
+    @cli_src.callback()
+    def src_callback():
+        """
+        Manage sources in the app.
+        """
+        print("Executed before all source commands")
 
-@cli_src.command("ls")
-def src_ls():
-    """List sources"""
-    print("List sources")
+    @cli_src.command("ls")
+    def src_ls():
+        """List sources"""
+        print("List sources")
 
+    @cli_src.command("install")
+    def src_install():
+        """Install sources"""
+        print("Install a source")
 
-@cli_src.command("install")
-def src_install():
-    """Install sources"""
-    print("Install a source")
+    @cli_src.command("update")
+    def src_update():
+        """Update sources"""
+        print("Update sources")
 
+    return cli_src
 
-@cli_src.command("update")
-def src_update():
-    """Update sources"""
-    print("Update sources")
 
+# Typer application, built by get_cli_app()
+_CLI_APP = None
 
-# Exception handler
-# ===============================
-def clean_terminate(err):
-    "Terminate nicely the program depending the exception"
+# Sub groups, only built when invoked or listed
+_LAZY_GROUPS = {
+    "group1": _build_cli_src,
+}
 
-    user_errors = (
-        PermissionError,
-        FileExistsError,
-        FileNotFoundError,
-        InterruptedError,
-        IsADirectoryError,
-        NotADirectoryError,
-        TimeoutError,
-    ) + (
-        MyAppException,
-        # yaml.parser.ParserError,
-        # sh.ErrorReturnCode,
-    )
 
-    if isinstance(err, user_errors):
+def _fast_path():
+    "Handle trivial flags before importing typer"
 
-        # Fetch extra error informations
-        rc = int(getattr(err, "rc", getattr(err, "errno", 1)))
-        advice = getattr(err, "advice", None)
-        if advice:
-            logger.warning(advice)
+    if sys.argv[1:] in (["--version"], ["-V"]):
+        print(app_version)
+        sys.exit(0)
 
-        # Log error and exit
-        logger.error(err)
-        err_name = err.__class__.__name__
-        logger.critical("MyApp exited with error %s (%s)", err_name, rc)
-        sys.exit(rc)
 
-    # Developper bug catchall
-    rc = 255
-    logger.error(traceback.format_exc())
-    logger.critical("Uncatched error: %s", err.__class__)
-    logger.critical("This is a bug, please report it.")
-    sys.exit(rc)
+def get_cli_app():
+    "Return the Typer application, imports typer and builds it on first call"
 
-# Core application definition
-# ===============================
+    global _CLI_APP  # pylint: disable=global-statement
+
+    if _CLI_APP is None:
+        # pylint: disable=import-outside-toplevel
+        from pathlib import Path
+        from typing import Optional
+
+        import typer
+
+        globals().update(
+            Path=Path,
+            Optional=Optional,
+            typer=typer,
+        )
+        _CLI_APP = _build_app()
+
+    return _CLI_APP
 
 
 def cli_run():
     "Return a MyApp App instance"
+
+    _fast_path()
+
     try:
-        return cli_app()
+        return get_cli_app()()
     # pylint: disable=broad-except
     except Exception as err:
         clean_terminate(err)